@@ -5,29 +5,144 @@ Admin panel functionality for DTM Test Bot
 Handles admin operations including statistics and question management
 """
 
+import asyncio
 import logging
+import time
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
+from config import Config
 from database import DatabaseManager
-from translations import TranslationManager
 
 logger = logging.getLogger(__name__)
 
+# Seconds between checks of the database for admin rights changed outside the bot
+_ADMIN_REFRESH_INTERVAL = 5.0
+
+# Display order of the questions statistics, taken from the subjects and languages the bot offers
+_SUBJECTS = Config.SUBJECTS
+_LANGUAGES = Config.SUPPORTED_LANGUAGES
+
+# Static admin panel keyboards and texts, built once and shared by all handlers
+_ADMIN_PANEL_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Statistika", callback_data="admin_statistics")],
+    [InlineKeyboardButton("📝 Savollar statistikasi", callback_data="admin_questions_stats")],
+    [InlineKeyboardButton("➕ Savol qo'shish", callback_data="admin_add_question")],
+    [InlineKeyboardButton("👥 Foydalanuvchilar", callback_data="admin_users")],
+    [InlineKeyboardButton("🔙 Orqaga", callback_data="back_to_menu")]
+])
+
+_BACK_TO_ADMIN_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Admin panelga", callback_data="admin_panel")]
+])
+
+_ADMIN_PANEL_TEXT = (
+    "👨‍💼 Admin Panel\n\n"
+    "Kerakli bo'limni tanlang:"
+)
+
+_ADD_QUESTION_INFO_TEXT = (
+    "➕ Savol qo'shish\n\n"
+    "Hozircha savollar to'g'ridan-to'g'ri ma'lumotlar bazasiga "
+    "qo'shilishi kerak.\n\n"
+    "Keyingi versiyalarda bot orqali savol qo'shish "
+    "funksiyasi qo'shiladi.\n\n"
+    "Ma'lumotlar bazasi fayli: data/dtm_test.db\n"
+    "Jadval nomi: questions"
+)
+
+_NO_ADMIN_RIGHTS_TEXT = "❌ Sizda admin huquqlari yo'q!"
+
+_STATS_ERROR_TEXT = "❌ Statistika ma'lumotlarini olishda xatolik yuz berdi."
+
 class AdminManager:
     def __init__(self, db: DatabaseManager):
         self.db = db
-        self.translations = TranslationManager()
         
         # Get super admin ID from config
-        from config import Config
         self.SUPER_ADMIN_ID = Config.SUPER_ADMIN_ID
         
         # Add super admin to database
         self.db.add_admin(self.SUPER_ADMIN_ID)
+        
+        # Admin IDs kept in memory; add_admin/remove_admin keep it in sync and
+        # _refresh_admin_ids() reloads it when users.is_admin is edited elsewhere
+        self._admin_ids = {self.SUPER_ADMIN_ID}
+        self._admin_revision = None
+        self._admin_checked_at = 0.0
+        self._refresh_admin_ids()
+        
+        # (timestamp, value) of the last user statistics lookup
+        self._stats_cache = (0.0, None)
+        
+        # Strong references to fire-and-forget tasks until they finish
+        self._bg_tasks = set()
+        
+        # Admin callback routes
+        self._dispatch = {
+            "admin_statistics": self.show_statistics,
+            "admin_questions_stats": self.show_questions_statistics,
+            "admin_add_question": self.show_add_question_info,
+            "admin_users": self.show_users_list,
+            "admin_panel": self.show_admin_panel
+        }
+    
+    def _refresh_admin_ids(self):
+        """Reload admin IDs if the admin revision in the database has moved"""
+        self._admin_checked_at = time.monotonic()
+        revision = self.db.get_admin_revision()
+        if revision is None or revision == self._admin_revision:
+            return
+        self._admin_ids = set(self.db.get_all_admin_ids()) | {self.SUPER_ADMIN_ID}
+        self._admin_revision = revision
     
     def is_admin(self, user_id: int) -> bool:
         """Check if user is admin"""
-        return user_id == self.SUPER_ADMIN_ID or self.db.is_admin(user_id)
+        if time.monotonic() - self._admin_checked_at >= _ADMIN_REFRESH_INTERVAL:
+            self._refresh_admin_ids()
+        return user_id in self._admin_ids
+    
+    def add_admin(self, user_id: int) -> bool:
+        """Grant admin rights to user"""
+        if not self.db.add_admin(user_id):
+            return False
+        self._admin_ids.add(user_id)
+        return True
+    
+    def remove_admin(self, user_id: int) -> bool:
+        """Revoke admin rights from user (super admin cannot be removed)"""
+        if user_id == self.SUPER_ADMIN_ID or not self.db.remove_admin(user_id):
+            return False
+        self._admin_ids.discard(user_id)
+        return True
+    
+    async def _get_stats_cached(self, ttl: float = 30) -> dict:
+        """Get user statistics off the event loop, reusing the previous result for ttl seconds"""
+        now = time.monotonic()
+        ts, stats = self._stats_cache
+        if stats and now - ts < ttl:
+            return stats
+        
+        stats = await asyncio.to_thread(self.db.get_user_statistics)
+        self._stats_cache = (now, stats)
+        return stats
+    
+    def _answer_in_background(self, query, text: str):
+        """Answer callback query without waiting for Telegram's response"""
+        task = asyncio.create_task(query.answer(text))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+    
+    async def _safe_edit(self, query, text: str, reply_markup: InlineKeyboardMarkup):
+        """Edit callback message, skipping the request when nothing would change"""
+        message = query.message
+        if message and message.text == text and message.reply_markup == reply_markup:
+            return
+        try:
+            await query.edit_message_text(text, reply_markup=reply_markup)
+        except BadRequest as e:
+            if "not modified" not in str(e):
+                raise
     
     async def show_admin_panel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show admin panel main menu"""
@@ -36,27 +151,10 @@ class AdminManager:
         user_id = update.effective_user.id
         
         if not self.is_admin(user_id):
-            await update.callback_query.answer("❌ Sizda admin huquqlari yo'q!")
+            self._answer_in_background(update.callback_query, _NO_ADMIN_RIGHTS_TEXT)
             return
         
-        lang = self.db.get_user_language(user_id)
-        t = self.translations.get_translation(lang)
-        
-        keyboard = [
-            [InlineKeyboardButton("📊 Statistika", callback_data="admin_statistics")],
-            [InlineKeyboardButton("📝 Savollar statistikasi", callback_data="admin_questions_stats")],
-            [InlineKeyboardButton("➕ Savol qo'shish", callback_data="admin_add_question")],
-            [InlineKeyboardButton("👥 Foydalanuvchilar", callback_data="admin_users")],
-            [InlineKeyboardButton("🔙 Orqaga", callback_data="back_to_menu")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        admin_text = (
-            "👨‍💼 Admin Panel\n\n"
-            "Kerakli bo'limni tanlang:"
-        )
-        
-        await update.callback_query.edit_message_text(admin_text, reply_markup=reply_markup)
+        await self._safe_edit(update.callback_query, _ADMIN_PANEL_TEXT, _ADMIN_PANEL_MARKUP)
     
     async def show_statistics(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show bot statistics"""
@@ -67,27 +165,26 @@ class AdminManager:
         if not self.is_admin(user_id):
             return
         
-        stats = self.db.get_user_statistics()
+        stats = await self._get_stats_cached()
         
         if not stats:
-            stats_text = "❌ Statistika ma'lumotlarini olishda xatolik yuz berdi."
+            stats_text = _STATS_ERROR_TEXT
         else:
-            stats_text = (
+            parts = [
                 f"📊 Bot Statistikasi\n\n"
                 f"👥 Jami foydalanuvchilar: {stats.get('total_users', 0)}\n"
                 f"📝 Jami testlar: {stats.get('total_tests', 0)}\n"
                 f"📈 O'rtacha ball: {stats.get('average_score', 0)}%\n\n"
                 f"📚 Fanlar bo'yicha:\n"
-            )
+            ]
             
             subject_stats = stats.get('subject_statistics', {})
             for subject, count in subject_stats.items():
-                stats_text += f"• {subject.title()}: {count} test\n"
-        
-        keyboard = [[InlineKeyboardButton("🔙 Admin panelga", callback_data="admin_panel")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+                parts.append(f"• {subject.title()}: {count} test\n")
+            
+            stats_text = "".join(parts)
         
-        await update.callback_query.edit_message_text(stats_text, reply_markup=reply_markup)
+        await self._safe_edit(update.callback_query, stats_text, _BACK_TO_ADMIN_MARKUP)
     
     async def show_questions_statistics(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show questions statistics by subject and language"""
@@ -98,30 +195,26 @@ class AdminManager:
         if not self.is_admin(user_id):
             return
         
-        subjects = ['mathematics', 'history', 'english', 'biology', 'chemistry', 'law']
-        languages = ['uz', 'ru', 'en']
+        counts = await asyncio.to_thread(self.db.get_questions_count_matrix)
         
-        stats_text = "📝 Savollar Statistikasi\n\n"
+        parts = ["📝 Savollar Statistikasi\n\n"]
         
-        total_questions = 0
-        for subject in subjects:
-            stats_text += f"📚 {subject.title()}:\n"
+        for subject in _SUBJECTS:
+            parts.append(f"📚 {subject.title()}:\n")
             subject_total = 0
             
-            for lang in languages:
-                count = self.db.get_questions_count(subject, lang)
-                stats_text += f"  • {lang.upper()}: {count} savol\n"
+            for lang in _LANGUAGES:
+                count = counts.get((subject, lang), 0)
+                parts.append(f"  • {lang.upper()}: {count} savol\n")
                 subject_total += count
             
-            stats_text += f"  Jami: {subject_total} savol\n\n"
-            total_questions += subject_total
+            parts.append(f"  Jami: {subject_total} savol\n\n")
         
-        stats_text += f"🔢 Umumiy savollar soni: {total_questions}"
+        total_questions = sum(counts.values())
+        parts.append(f"🔢 Umumiy savollar soni: {total_questions}")
+        stats_text = "".join(parts)
         
-        keyboard = [[InlineKeyboardButton("🔙 Admin panelga", callback_data="admin_panel")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.callback_query.edit_message_text(stats_text, reply_markup=reply_markup)
+        await self._safe_edit(update.callback_query, stats_text, _BACK_TO_ADMIN_MARKUP)
     
     async def show_users_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show users list (simplified)"""
@@ -132,9 +225,7 @@ class AdminManager:
         if not self.is_admin(user_id):
             return
         
-        stats = self.db.get_user_statistics()
-        total_users = stats.get('total_users', 0)
-        total_tests = stats.get('total_tests', 0)
+        total_users, total_tests = await asyncio.to_thread(self.db.get_user_counts)
         
         users_text = (
             f"👥 Foydalanuvchilar\n\n"
@@ -143,51 +234,28 @@ class AdminManager:
             f"Batafsil ma'lumot uchun ma'lumotlar bazasiga murojaat qiling."
         )
         
-        keyboard = [[InlineKeyboardButton("🔙 Admin panelga", callback_data="admin_panel")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.callback_query.edit_message_text(users_text, reply_markup=reply_markup)
+        await self._safe_edit(update.callback_query, users_text, _BACK_TO_ADMIN_MARKUP)
     
     async def handle_admin_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE, callback_data: str):
-        """Handle admin panel callbacks"""
+        """Handle admin panel callbacks (answers the callback query itself)"""
         if not update.effective_user or not update.callback_query:
             return
         user_id = update.effective_user.id
         
         if not self.is_admin(user_id):
-            await update.callback_query.answer("❌ Sizda admin huquqlari yo'q!")
+            self._answer_in_background(update.callback_query, _NO_ADMIN_RIGHTS_TEXT)
             return
         
-        if callback_data == "admin_statistics":
-            await self.show_statistics(update, context)
-        
-        elif callback_data == "admin_questions_stats":
-            await self.show_questions_statistics(update, context)
-        
-        elif callback_data == "admin_add_question":
-            await self.show_add_question_info(update, context)
-        
-        elif callback_data == "admin_users":
-            await self.show_users_list(update, context)
+        handler = self._dispatch.get(callback_data)
+        if not handler:
+            await update.callback_query.answer()
+            return
         
-        elif callback_data == "admin_panel":
-            await self.show_admin_panel(update, context)
+        # Answer the query while the handler runs so the client spinner stops immediately
+        await asyncio.gather(update.callback_query.answer(), handler(update, context))
     
     async def show_add_question_info(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show information about adding questions"""
         if not update.callback_query:
             return
-        info_text = (
-            "➕ Savol qo'shish\n\n"
-            "Hozircha savollar to'g'ridan-to'g'ri ma'lumotlar bazasiga "
-            "qo'shilishi kerak.\n\n"
-            "Keyingi versiyalarda bot orqali savol qo'shish "
-            "funksiyasi qo'shiladi.\n\n"
-            "Ma'lumotlar bazasi fayli: data/dtm_test.db\n"
-            "Jadval nomi: questions"
-        )
-        
-        keyboard = [[InlineKeyboardButton("🔙 Admin panelga", callback_data="admin_panel")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.callback_query.edit_message_text(info_text, reply_markup=reply_markup)
+        await self._safe_edit(update.callback_query, _ADD_QUESTION_INFO_TEXT, _BACK_TO_ADMIN_MARKUP)
@@ -17,18 +17,18 @@ class Config:
     DATABASE_PATH = "data/dtm_test.db"
     
     # Supported languages
-    SUPPORTED_LANGUAGES = ['uz', 'ru', 'en']
+    SUPPORTED_LANGUAGES = ('uz', 'ru', 'en')
     DEFAULT_LANGUAGE = 'uz'
     
     # Subjects available for testing
-    SUBJECTS = [
+    SUBJECTS = (
         'mathematics',
         'history', 
         'english',
         'biology',
         'chemistry',
         'law'
-    ]
+    )
     
     # Test settings
     QUESTIONS_PER_TEST = 10
@@ -45,15 +45,23 @@ class Config:
     MAX_MESSAGE_LENGTH = 4096
     MAX_CAPTION_LENGTH = 1024
     
+    # Set once the directories above have been created
+    _data_dir_ensured = False
+    _trans_dir_ensured = False
+    
     @classmethod
     def get_database_path(cls) -> str:
         """Get database file path"""
         # Ensure data directory exists
-        os.makedirs(cls.DATA_DIR, exist_ok=True)
+        if not cls._data_dir_ensured:
+            os.makedirs(cls.DATA_DIR, exist_ok=True)
+            cls._data_dir_ensured = True
         return cls.DATABASE_PATH
     
     @classmethod
     def get_translations_path(cls, language: str) -> str:
         """Get translation file path for specific language"""
-        os.makedirs(cls.TRANSLATIONS_DIR, exist_ok=True)
+        if not cls._trans_dir_ensured:
+            os.makedirs(cls.TRANSLATIONS_DIR, exist_ok=True)
+            cls._trans_dir_ensured = True
         return os.path.join(cls.TRANSLATIONS_DIR, f"{language}.json")
@@ -6,12 +6,16 @@ Supports 3 languages and 6 subjects with comprehensive testing system
 """
 
 import os
+import asyncio
 import logging
 import json
-from datetime import datetime
+import time
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
-from database import DatabaseManager
+from database import DatabaseManager, Question
 from translations import TranslationManager
 from admin import AdminManager
 from config import Config
@@ -24,6 +28,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Abandoned test sessions are dropped after this many seconds, and at most
+# this many sessions are kept at once
+SESSION_TTL = 3600
+MAX_ACTIVE_TESTS = 100_000
+
+# Answer option labels and a getter for the matching Question fields
+_OPTION_LABELS = ('A', 'B', 'C', 'D')
+_OPTION_TEXTS = attrgetter('option_a', 'option_b', 'option_c', 'option_d')
+
+# Stored for correct answers that are not a single ASCII character; no recorded answer can equal it
+_NO_ANSWER_MATCH = 0xFF
+
+def _answer_code(question: Question) -> int:
+    """Byte code of a question's correct answer letter"""
+    # upper() can expand one character into several ('ß' -> 'SS'), so check the result's length
+    letter = question.correct_answer[:1].upper()
+    return ord(letter) if len(letter) == 1 and letter.isascii() else _NO_ANSWER_MATCH
+
+@dataclass(slots=True)
+class TestSession:
+    """State of one user's running test; questions are shared with the database's question cache"""
+    user_id: int
+    subject: str
+    questions: Tuple[Question, ...]
+    current_question: int = 0
+    # One ASCII letter code per question (0 = unanswered), compared bytewise with correct
+    answers: bytearray = field(init=False)
+    correct: bytes = field(init=False)
+    start_time: float = field(default_factory=time.monotonic)
+    test_answers: Optional[List[Dict]] = None
+    test_result_id: Optional[int] = None
+    
+    def __post_init__(self):
+        self.answers = bytearray(len(self.questions))
+        self.correct = bytes(map(_answer_code, self.questions))
+
 class DTMTestBot:
     def __init__(self):
         self.db = DatabaseManager()
@@ -34,8 +74,37 @@ class DTMTestBot:
         # Initialize database
         self.db.init_database()
         
-        # Store current test sessions
-        self.active_tests = {}
+        # Store current test sessions, oldest first (see _store_test_session)
+        self.active_tests: Dict[int, TestSession] = {}
+        
+        # Strong references to fire-and-forget database tasks until they finish
+        self._bg_tasks = set()
+        
+        # Callback routing: exact callback data, then the prefix up to the first "_"
+        self._exact_routes = {
+            "select_subject": self.show_subject_selection,
+            "my_results": self.show_results,
+            "change_language": self.show_language_selection,
+            "help": self.show_help,
+            "back_to_menu": self.back_to_menu,
+            "cancel_test": self.cancel_test,
+            "show_analysis": self.show_analysis,
+        }
+        self._prefix_routes = {
+            "lang_": self.select_language,
+            "subject_": self.start_test,
+            "answer_": self.answer_selected,
+        }
+    
+    async def _db(self, func, *args, **kwargs):
+        """Run a blocking database call in a worker thread so the event loop keeps serving updates"""
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    def _db_in_background(self, func, *args):
+        """Run a non-critical database write in a worker thread without waiting for it"""
+        task = asyncio.create_task(self._db(func, *args))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
     
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
@@ -45,8 +114,8 @@ class DTMTestBot:
         username = update.effective_user.username or "Unknown"
         first_name = update.effective_user.first_name or ""
         
-        # Register user if not exists
-        self.db.register_user(user_id, username, first_name)
+        # Register user if not exists; the menu does not depend on the insert
+        self._db_in_background(self.db.register_user, user_id, username, first_name)
         
         # Check if user has selected language
         user_lang = self.db.get_user_language(user_id)
@@ -130,27 +199,34 @@ class DTMTestBot:
         t = self.translations.get_translation(lang)
         
         # Get random questions for the subject
-        questions = self.db.get_random_questions(subject, lang, 10)
+        # Reads the question revision (and reloads the pools after edits), so keep it off the loop
+        questions = await self._db(self.db.get_random_questions, subject, lang, 10)
         
         if not questions:
             await update.callback_query.answer(t["no_questions_available"])
             return
         
         # Store test session
-        test_session = {
-            'user_id': user_id,
-            'subject': subject,
-            'questions': questions,
-            'current_question': 0,
-            'answers': {},
-            'start_time': datetime.now()
-        }
-        
-        self.active_tests[user_id] = test_session
+        self._store_test_session(TestSession(user_id, subject, tuple(questions)))
         
         # Show first question
         await self.show_question(update, context)
     
+    def _store_test_session(self, session: TestSession):
+        """Store a new test session and drop expired or excess old ones"""
+        active_tests = self.active_tests
+        # Re-insert so the dict stays ordered by start time
+        active_tests.pop(session.user_id, None)
+        active_tests[session.user_id] = session
+        
+        expired_before = session.start_time - SESSION_TTL
+        while True:
+            oldest_user_id = next(iter(active_tests))
+            if (active_tests[oldest_user_id].start_time > expired_before
+                    and len(active_tests) <= MAX_ACTIVE_TESTS):
+                break
+            del active_tests[oldest_user_id]
+    
     async def show_question(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show current question"""
         if not update.effective_user or not update.callback_query:
@@ -164,8 +240,8 @@ class DTMTestBot:
             return
         
         test_session = self.active_tests[user_id]
-        current_q_idx = test_session['current_question']
-        questions = test_session['questions']
+        current_q_idx = test_session.current_question
+        questions = test_session.questions
         
         if current_q_idx >= len(questions):
             await self.finish_test(update, context)
@@ -176,19 +252,18 @@ class DTMTestBot:
         total_questions = len(questions)
         
         # Create answer options
-        keyboard = []
-        options = ['A', 'B', 'C', 'D']
-        for i, option in enumerate(options):
-            option_text = question[f'option_{option.lower()}']
-            if option_text:
-                keyboard.append([InlineKeyboardButton(f"{option}. {option_text}", callback_data=f"answer_{option}_{current_q_idx}")])
+        keyboard = [
+            [InlineKeyboardButton(f"{label}. {option_text}", callback_data=f"answer_{label}_{current_q_idx}")]
+            for label, option_text in zip(_OPTION_LABELS, _OPTION_TEXTS(question))
+            if option_text
+        ]
         
         keyboard.append([InlineKeyboardButton(t["cancel_test"], callback_data="cancel_test")])
         reply_markup = InlineKeyboardMarkup(keyboard)
         
         question_text = (
             f"❓ {t['question']} {question_num}/{total_questions}\n\n"
-            f"{question['question_text']}"
+            f"{question.question_text}"
         )
         
         await update.callback_query.edit_message_text(question_text, reply_markup=reply_markup)
@@ -205,8 +280,9 @@ class DTMTestBot:
         test_session = self.active_tests[user_id]
         
         # Store answer
-        test_session['answers'][question_idx] = answer
-        test_session['current_question'] = question_idx + 1
+        if len(answer) == 1 and answer.isascii() and 0 <= question_idx < len(test_session.answers):
+            test_session.answers[question_idx] = ord(answer.upper())
+        test_session.current_question = question_idx + 1
         
         # Show next question
         await self.show_question(update, context)
@@ -223,42 +299,38 @@ class DTMTestBot:
             return
         
         test_session = self.active_tests[user_id]
-        questions = test_session['questions']
-        answers = test_session['answers']
+        questions = test_session.questions
+        answers = test_session.answers
+        correct = test_session.correct
         
         # Calculate results and prepare detailed analysis
-        correct_count = 0
+        correct_count = sum(map(int.__eq__, answers, correct))
         total_questions = len(questions)
         test_answers = []
         
-        for i, question in enumerate(questions):
-            user_answer = answers.get(i, '')
-            is_correct = user_answer.lower() == question['correct_answer'].lower()
-            if is_correct:
-                correct_count += 1
-            
+        for question, user_code, correct_code in zip(questions, answers, correct):
             # Store detailed answer for analysis
             test_answers.append({
-                'question': question['question_text'],
-                'user_answer': user_answer.upper(),
-                'correct_answer': question['correct_answer'].upper(),
-                'is_correct': is_correct,
-                'option_a': question['option_a'],
-                'option_b': question['option_b'],
-                'option_c': question['option_c'],
-                'option_d': question['option_d']
+                'question': question.question_text,
+                'user_answer': chr(user_code) if user_code else '',
+                'correct_answer': question.correct_answer.upper(),
+                'is_correct': user_code == correct_code,
+                'option_a': question.option_a,
+                'option_b': question.option_b,
+                'option_c': question.option_c,
+                'option_d': question.option_d
             })
         
         wrong_count = total_questions - correct_count
         percentage = round((correct_count / total_questions) * 100, 1)
         
         # Save result to database with detailed answers
-        end_time = datetime.now()
-        duration = int((end_time - test_session['start_time']).total_seconds())
+        duration = int(time.monotonic() - test_session.start_time)
         
-        test_result_id = self.db.save_test_result(
+        test_result_id = await self._db(
+            self.db.save_test_result,
             user_id=user_id,
-            subject=test_session['subject'],
+            subject=test_session.subject,
             correct_answers=correct_count,
             total_questions=total_questions,
             percentage=percentage,
@@ -267,12 +339,12 @@ class DTMTestBot:
         )
         
         # Store test analysis in session for later access
-        test_session['test_answers'] = test_answers
-        test_session['test_result_id'] = test_result_id
+        test_session.test_answers = test_answers
+        test_session.test_result_id = test_result_id
         
         # Create result message
-        subject_key = f"subject_{test_session['subject']}"
-        subject_name = t.get(subject_key, test_session['subject'].title())
+        subject_key = f"subject_{test_session.subject}"
+        subject_name = t.get(subject_key, test_session.subject.title())
         duration_min = duration // 60
         duration_sec = duration % 60
         
@@ -304,7 +376,7 @@ class DTMTestBot:
         # Get test analysis from active session
         test_answers = None
         if user_id in self.active_tests:
-            test_answers = self.active_tests[user_id].get('test_answers')
+            test_answers = self.active_tests[user_id].test_answers
             # Clear session after showing analysis
             del self.active_tests[user_id]
         
@@ -315,7 +387,8 @@ class DTMTestBot:
             )
         else:
             # Create detailed analysis
-            analysis_text = f"📋 {t['test_analysis']}\n\n"
+            parts = [f"📋 {t['test_analysis']}\n\n"]
+            total_len = len(parts[0])
             
             correct_icon = "✅"
             wrong_icon = "❌"
@@ -326,17 +399,21 @@ class DTMTestBot:
                 
                 question_text = answer['question'][:60] + "..." if len(answer['question']) > 60 else answer['question']
                 
-                analysis_text += (
+                block = (
                     f"{icon} {i}. {status}\n"
                     f"❓ {question_text}\n"
                     f"👤 Javobingiz: {answer['user_answer']}\n"
                     f"✓ To'g'ri: {answer['correct_answer']}\n\n"
                 )
+                parts.append(block)
+                total_len += len(block)
                 
                 # Limit message length for Telegram
-                if len(analysis_text) > 3500:
-                    analysis_text += f"... va boshqa {len(test_answers) - i} ta savol"
+                if total_len > 3500:
+                    parts.append(f"... va boshqa {len(test_answers) - i} ta savol")
                     break
+            
+            analysis_text = "".join(parts)
         
         keyboard = [[InlineKeyboardButton(t["back_to_menu"], callback_data="back_to_menu")]]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -351,7 +428,7 @@ class DTMTestBot:
         lang = self.db.get_user_language(user_id)
         t = self.translations.get_translation(lang)
         
-        results = self.db.get_user_results(user_id, limit=5)
+        results = await self._db(self.db.get_user_results, user_id, limit=5)
         
         if not results:
             results_text = t["no_results_yet"]
@@ -359,12 +436,12 @@ class DTMTestBot:
             results_text = f"📊 {t['your_results']}\n\n"
             
             for i, result in enumerate(results, 1):
-                subject_name = t.get(f"subject_{result['subject']}", result['subject'].title())
-                date_str = datetime.fromisoformat(result['test_date']).strftime("%d.%m.%Y %H:%M")
+                subject_name = t.get(f"subject_{result.subject}", result.subject.title())
+                date_str = result.test_date_str
                 
                 results_text += (
                     f"{i}. 📚 {subject_name}\n"
-                    f"   📈 {result['percentage']}% ({result['correct_answers']}/{result['total_questions']})\n"
+                    f"   📈 {result.percentage}% ({result.correct_answers}/{result.total_questions})\n"
                     f"   📅 {date_str}\n\n"
                 )
         
@@ -391,64 +468,50 @@ class DTMTestBot:
         if not update.callback_query or not update.effective_user:
             return
         query = update.callback_query
-        await query.answer()
-        
         data = query.data
-        if not data:
-            return
-        user_id = update.effective_user.id
-        
-        # Language selection
-        if data.startswith("lang_"):
-            lang = data.split("_")[1]
-            self.db.set_user_language(user_id, lang)
-            await self.show_main_menu(update, context, lang)
         
-        # Main menu navigation
-        elif data == "select_subject":
-            await self.show_subject_selection(update, context)
-        
-        elif data == "my_results":
-            await self.show_results(update, context)
-        
-        elif data == "change_language":
-            await self.show_language_selection(update, context)
-        
-        elif data == "help":
-            await self.show_help(update, context)
-        
-        elif data == "back_to_menu":
-            lang = self.db.get_user_language(user_id)
-            await self.show_main_menu(update, context, lang)
-        
-        # Subject selection
-        elif data.startswith("subject_"):
-            subject = data.split("_", 1)[1]
-            await self.start_test(update, context, subject)
-        
-        # Answer handling
-        elif data.startswith("answer_"):
-            parts = data.split("_")
-            answer = parts[1]
-            question_idx = int(parts[2])
-            await self.handle_answer(update, context, answer, question_idx)
+        # Admin panel answers its callbacks itself
+        if data and data.startswith("admin_"):
+            await self.admin.handle_admin_callback(update, context, data)
+            return
         
-        # Test control
-        elif data == "cancel_test":
-            if user_id in self.active_tests:
-                del self.active_tests[user_id]
-            lang = self.db.get_user_language(user_id)
-            await self.show_main_menu(update, context, lang)
+        await query.answer()
         
-        elif data == "show_analysis":
-            await self.show_analysis(update, context)
+        if not data:
+            return
         
-        # Admin panel
-        elif data == "admin_panel":
-            await self.admin.show_admin_panel(update, context)
+        handler = self._exact_routes.get(data)
+        if handler:
+            await handler(update, context)
+            return
         
-        elif data.startswith("admin_"):
-            await self.admin.handle_admin_callback(update, context, data)
+        split_at = data.find("_") + 1
+        handler = self._prefix_routes.get(data[:split_at]) if split_at else None
+        if handler:
+            await handler(update, context, data[split_at:])
+    
+    async def select_language(self, update: Update, context: ContextTypes.DEFAULT_TYPE, lang: str):
+        """Save the chosen language and show the main menu"""
+        lang = lang.split("_")[0]
+        await self._db(self.db.set_user_language, update.effective_user.id, lang)
+        await self.show_main_menu(update, context, lang)
+    
+    async def back_to_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Return to the main menu"""
+        lang = self.db.get_user_language(update.effective_user.id)
+        await self.show_main_menu(update, context, lang)
+    
+    async def cancel_test(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Drop the running test and return to the main menu"""
+        self.active_tests.pop(update.effective_user.id, None)
+        await self.back_to_menu(update, context)
+    
+    async def answer_selected(self, update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str):
+        """Parse "<option>_<question index>" callback data and record the answer"""
+        parts = payload.split("_")
+        answer = parts[0]
+        question_idx = int(parts[1])
+        await self.handle_answer(update, context, answer, question_idx)
 
 def main():
     """Main function to run the bot"""
@@ -471,6 +534,7 @@ def main():
     # Start bot
     logger.info("DTM Test Bot started successfully!")
     application.run_polling(allowed_updates=Update.ALL_TYPES)
+    bot.db.close()
 
 if __name__ == "__main__":
     main()
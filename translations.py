@@ -7,6 +7,7 @@ Handles multi-language support for the bot interface
 
 import json
 import os
+import sys
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,8 @@ class TranslationManager:
     def __init__(self, translations_dir: str = "translations"):
         self.translations_dir = translations_dir
         self.translations = {}
+        # language -> bound dict.get of that language's table, used by get_text
+        self._getters = {}
         self.load_translations()
     
     def load_translations(self):
@@ -33,6 +36,15 @@ class TranslationManager:
             except json.JSONDecodeError as e:
                 logger.error(f"Error parsing {file_path}: {e}")
                 self.translations[lang] = {}
+        
+        # Fill keys missing from a language with the Uzbek text once here,
+        # so lookups never need a fallback chain; interned keys hash and compare faster
+        base = self.translations.get('uz', {})
+        for lang in languages:
+            merged = {**base, **self.translations[lang]}
+            self.translations[lang] = {sys.intern(key): value for key, value in merged.items()}
+        
+        self._getters = {lang: table.get for lang, table in self.translations.items()}
     
     def get_translation(self, language: str) -> dict:
         """Get translations for specific language"""
@@ -40,8 +52,8 @@ class TranslationManager:
     
     def get_text(self, language: str, key: str, default: str = "") -> str:
         """Get specific translation text"""
-        translations = self.get_translation(language)
-        return translations.get(key, default)
+        getter = self._getters.get(language) or self._getters['uz']
+        return getter(key, default)
     
     def reload_translations(self):
         """Reload translation files"""